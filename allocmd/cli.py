@@ -4,9 +4,13 @@ import subprocess
 from jinja2 import Environment, FileSystemLoader
 from importlib.resources import files
 from termcolor import colored, cprint
-from .utilities.utils import generate_all_files, print_allora_banner, run_key_generate_command, deployWorker, deployValidator, generateWorkerAccount, generateProdCompose, check_docker_running, blocklessNode, fundAddress
+from .utilities.utils import generate_all_files, print_allora_banner, run_key_generate_command, deployWorker, deployValidator, generateWorkerAccount, generateProdCompose, check_docker_running, blocklessNode, fundAddress, confirm, fetch_content_with_curl, open_keystore, watchNodeIp
 from .utilities.typings import Command, BlocklessNodeType
 from .utilities.constants import cliVersion
+from .utilities.config import ConfigError, load_config, save_config
+from .utilities.keystore import Keystore, KeystoreError, keystore_path
+from .utilities.heads import DEFAULT_TIMEOUT, HEADS_URL, parse_heads, probe_heads
+from .utilities.nodetypes import get_node_type
 
 template_path = files('allocmd').joinpath('templates')
 env = Environment(loader=FileSystemLoader(template_path), autoescape=True)
@@ -27,26 +31,40 @@ def generate():
 @click.option('--network', required=True, type=click.Choice(['allora-testnet-1', 'edgenet']), help='The chain network to generate for')
 @click.option('--name', required=False, help='Name of the worker.')
 @click.option('--topic', required=False, type=int, help='The topic ID the worker is registered with.')
-def worker(environment, network, name=None, topic=None):
+@click.option('--yes', '-y', 'assume_yes', is_flag=True, help='Run non-interactively, answering yes to every confirmation.')
+def worker(environment, network, name=None, topic=None, assume_yes=False):
     """Initialize your Allora Worker Node with necessary boilerplates"""
 
-    blocklessNode(environment, env, BlocklessNodeType.worker.name, network, name, topic)
+    blocklessNode(environment, env, BlocklessNodeType.worker.name, network, name, topic, assume_yes)
 
 @generate.command()
 @click.option('--env', 'environment', required=True, type=click.Choice(['dev', 'prod']), help='Environment to generate for')
 @click.option('--network', required=True, type=click.Choice(['allora-testnet-1', 'edgenet']), help='The chain network to generate for')
 @click.option('--name', required=False, help='Name of the reputer.')
 @click.option('--topic', required=False, type=int, help='The topic ID the reputer is registered with.')
-def reputer(environment, network, name=None, topic=None):
+@click.option('--yes', '-y', 'assume_yes', is_flag=True, help='Run non-interactively, answering yes to every confirmation.')
+def reputer(environment, network, name=None, topic=None, assume_yes=False):
     """Initialize your Allora Reputer Node with necessary boilerplates"""
 
-    blocklessNode(environment, env, BlocklessNodeType.reputer.name, network, name, topic)
+    blocklessNode(environment, env, BlocklessNodeType.reputer.name, network, name, topic, assume_yes)
 
+@generate.command(name='node')
+@click.option('--type', 'node_type', required=True, help='Node type to generate, built-in (worker, reputer) or registered by an installed plugin.')
+@click.option('--env', 'environment', required=True, type=click.Choice(['dev', 'prod']), help='Environment to generate for')
+@click.option('--network', required=True, type=click.Choice(['allora-testnet-1', 'edgenet']), help='The chain network to generate for')
+@click.option('--name', required=False, help='Name of the node.')
+@click.option('--topic', required=False, type=int, help='The topic ID the node is registered with.')
+@click.option('--yes', '-y', 'assume_yes', is_flag=True, help='Run non-interactively, answering yes to every confirmation.')
+def node(node_type, environment, network, name=None, topic=None, assume_yes=False):
+    """Initialize an Allora Node of any registered node type with necessary boilerplates"""
+
+    blocklessNode(environment, env, node_type, network, name, topic, assume_yes)
 
 @generate.command()
 @click.option('--name',required=True, help='Name of the validator.')
 @click.option('--network', required=True, type=click.Choice(['edgenet']), help='Your preffered chain network to run the validator on.')
-def validator(name=None, network=None):
+@click.option('--yes', '-y', 'assume_yes', is_flag=True, help='Run non-interactively, answering yes to every confirmation.')
+def validator(name=None, network=None, assume_yes=False):
     """Initialize your Allora Worker Node with necessary boilerplates"""
 
     if not check_docker_running():
@@ -58,7 +76,7 @@ def validator(name=None, network=None):
     print(colored("Allora CLI assists in the seamless creation and deployment of Allora validator nodes", 'yellow'))
     cprint(f"\nThis command will generate some files in the directory named '{name}'.", 'cyan')
     
-    if click.confirm(colored("\nWould you like to proceed?", 'white', attrs=['bold']), default=True):
+    if confirm("\nWould you like to proceed?", assume_yes):
         cprint("\nProceeding with the creation of validator node directory...", 'green')
 
         os.makedirs(f"{name}/validator/scripts", exist_ok=True)
@@ -95,6 +113,141 @@ def fund(address=None, network=None):
 
 cli.add_command(fund)
 
+@click.command(name='watch-ip')
+@click.option('--interval', default=60, show_default=True, type=click.IntRange(min=5), help='Seconds between public IP checks.')
+@click.option('--once', is_flag=True, help='Check and update once instead of watching.')
+def watch_ip(interval=60, once=False):
+    """keep the node dialback address in sync with its public IP"""
+
+    watchNodeIp(interval, once)
+
+cli.add_command(watch_ip)
+
+@cli.group()
+def keystore():
+    """manage the encrypted keystore holding node mnemonics and private keys."""
+    pass
+
+@keystore.command(name='list')
+def list_keys():
+    """list the stored handles and their addresses"""
+
+    if not os.path.exists(keystore_path()):
+        cprint(f"no keystore found at {keystore_path()}", 'yellow')
+        return
+    with Keystore(keystore_path(), None) as store:
+        for handle, address in store.addresses():
+            print(colored(handle, 'cyan') + f"  {address}")
+
+@keystore.command(name='import')
+@click.argument('source', type=click.File('r'))
+def import_keys(source):
+    """bulk import keys from a JSON lines file (handle, address, mnemonic, hex_coded_pk)"""
+
+    try:
+        with open_keystore() as store:
+            count = store.import_jsonl(source)
+    except (KeystoreError, ValueError, TypeError) as e:
+        cprint(f"Error importing keys: {e}", 'red', attrs=['bold'])
+        return
+    cprint(f"{count} keys imported into {keystore_path()}", 'green')
+
+@keystore.command(name='export')
+@click.argument('destination', type=click.Path(dir_okay=False, writable=True))
+@click.option('--handle', 'handles', multiple=True, help='Only export this handle, can be repeated.')
+def export_keys(destination, handles):
+    """export decrypted keys as JSON lines, to be imported elsewhere"""
+
+    try:
+        with open_keystore() as store:
+            # the export holds plaintext keys, create it readable only by the owner
+            fd = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.fchmod(fd, 0o600)
+            with os.fdopen(fd, 'w') as file:
+                count = store.export_jsonl(file, handles or None)
+    except (KeystoreError, OSError) as e:
+        cprint(f"Error exporting keys: {e}", 'red', attrs=['bold'])
+        return
+    cprint(f"{count} keys exported, the output is not encrypted, keep it safe", 'yellow')
+
+@keystore.command(name='remove')
+@click.argument('handle')
+def remove_key(handle):
+    """remove the keys stored under a handle"""
+
+    if not os.path.exists(keystore_path()):
+        cprint(f"no keystore found at {keystore_path()}", 'red')
+        return
+    with Keystore(keystore_path(), None) as store:
+        if store.delete(handle):
+            cprint(f"'{handle}' removed from the keystore", 'green')
+        else:
+            cprint(f"no keys stored under handle '{handle}'", 'red')
+
+def validate_node_type(ctx, param, value):
+    # resolved when used rather than as a click.Choice, so node type plugins are only loaded by commands that need them
+    if value is not None:
+        try:
+            get_node_type(value)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+    return value
+
+@cli.group()
+def heads():
+    """inspect the Allora head nodes your worker/reputer bootstraps from."""
+    pass
+
+@heads.command()
+@click.option('--network', required=False, type=click.Choice(['allora-testnet-1', 'edgenet']), help='Probe the published heads of this chain network.')
+@click.option('--file', 'heads_file', required=False, type=click.Path(exists=True, dir_okay=False), help='Probe the heads listed in this file instead.')
+@click.option('--timeout', default=DEFAULT_TIMEOUT, show_default=True, type=float, help='Seconds to wait for each head to answer.')
+@click.option('--update-config', 'node_type', required=False, callback=validate_node_type, help='Write the ranked heads to allora_heads of ./config.yaml for this node type (worker, reputer, ...).')
+def probe(network=None, heads_file=None, timeout=DEFAULT_TIMEOUT, node_type=None):
+    """rank head nodes by measured latency and reachability"""
+
+    if node_type:
+        try:
+            config = load_config(os.path.join(os.getcwd(), 'config.yaml'), node_type)
+        except ConfigError as e:
+            cprint(f"Error reading config file: {e}", 'red', attrs=['bold'])
+            return
+
+    if heads_file:
+        with open(heads_file, 'r') as file:
+            content = file.read()
+    elif network:
+        content = fetch_content_with_curl(HEADS_URL.format(network=network))
+    elif node_type:
+        content = config.node.allora_heads
+    else:
+        cprint("Please provide --network, --file or --update-config to pick the heads to probe", 'red')
+        return
+
+    multiaddrs = parse_heads(content)
+    if not multiaddrs:
+        cprint("No head multiaddrs found to probe", 'red')
+        return
+
+    cprint(f"Probing {len(multiaddrs)} head nodes...", 'cyan')
+    probes = probe_heads(multiaddrs, timeout)
+    for rank, result in enumerate(probes, start=1):
+        if not result.reachable:
+            print(colored(f"{rank:>3}. unreachable  ", 'red') + f"{result.multiaddr}  ({result.error})")
+        elif not result.handshake:
+            print(colored(f"{rank:>3}. {result.total_ms:8.1f} ms  ", 'yellow') + f"{result.multiaddr}  ({result.error})")
+        else:
+            print(colored(f"{rank:>3}. {result.total_ms:8.1f} ms  ", 'green') + result.multiaddr)
+
+    reachable = [result.multiaddr for result in probes if result.reachable]
+    if node_type:
+        if not reachable:
+            cprint("\nNo head node could be reached, config.yaml left unchanged", 'yellow')
+            return
+        config.node.allora_heads = ','.join(reachable)
+        save_config(config)
+        cprint(f"\nconfig.yaml updated with {len(reachable)} heads, best first", 'green')
+
 
 
 
@@ -158,13 +311,14 @@ def terminate():
 
 # @click.command()
 # @click.option('--type', 'type_', required=True, type=click.Choice(['validator', 'worker'], case_sensitive=False), help='The allora resource type you want to deploy.')
-def deploy(type_):
+# @click.option('--yes', '-y', 'assume_yes', is_flag=True, help='Run non-interactively, answering yes to every confirmation.')
+def deploy(type_, assume_yes=False):
     """Deploy resource production kubernetes cluster"""
 
     if type_ == 'worker':
-        deployWorker(env)
+        deployWorker(env, assume_yes)
     elif type_ == 'validator':
-        deployValidator(env)
+        deployValidator(env, assume_yes)
     else:
         click.echo("Invalid resource type specified.")
 
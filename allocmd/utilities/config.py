@@ -0,0 +1,205 @@
+import os
+import yaml
+from dataclasses import dataclass, fields
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+INT_FIELDS = ('topic_id', 'chain_topic_id')
+
+_cache = {}
+
+
+class ConfigError(ValueError):
+    """Raised when a config.yaml cannot be parsed or is missing values needed by a command."""
+
+
+@dataclass
+class NodeConfig:
+    """The `<node type>:` section of config.yaml."""
+
+    __slots__ = (
+        'allora_heads', 'allora_rpc_address', 'allora_api_address', 'topic_id',
+        'key_handle', 'mnemonic', 'hex_coded_pk', 'address',
+        'image_uri', 'image_tag', 'boot_nodes', 'chain_rpc_address', 'chain_topic_id',
+    )
+    allora_heads: str
+    allora_rpc_address: str
+    allora_api_address: str
+    topic_id: int
+    key_handle: str
+    mnemonic: str
+    hex_coded_pk: str
+    address: str
+    image_uri: str
+    image_tag: str
+    boot_nodes: str
+    chain_rpc_address: str
+    chain_topic_id: int
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field.name: data.get(field.name) for field in fields(cls)})
+
+    def has_account(self):
+        return bool(self.address and (self.key_handle or (self.mnemonic and self.hex_coded_pk)))
+
+
+@dataclass
+class AlloraConfig:
+    """A parsed config.yaml, bound to the file it was loaded from."""
+
+    __slots__ = ('path', 'node_type', 'name', 'network', 'faucet_url', 'node_public_ip', 'node')
+    path: str
+    node_type: str
+    name: str
+    network: str
+    faucet_url: str
+    node_public_ip: str
+    node: NodeConfig
+
+
+def _validate(data, path, node_type, required):
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path}: expected a mapping at the top level")
+
+    section = data.get(node_type)
+    if not isinstance(section, dict):
+        raise ConfigError(f"{path}: missing '{node_type}' section")
+
+    problems = []
+    if not data.get('name'):
+        problems.append("name is missing")
+    for key in required:
+        if section.get(key) in (None, ''):
+            problems.append(f"{node_type}.{key} is missing")
+    for key in INT_FIELDS:
+        value = section.get(key)
+        if value not in (None, '') and not isinstance(value, int):
+            problems.append(f"{node_type}.{key} must be an integer, got {value!r}")
+    if problems:
+        raise ConfigError(f"{path}: " + "; ".join(problems))
+
+
+def load_config(path, node_type, required=()):
+    """Load and validate config.yaml, reusing the parsed result while the file is unchanged.
+
+    `required` lists the `<node type>:` keys the calling command needs, so a missing value
+    is reported before any work starts instead of as a KeyError halfway through.
+    """
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        raise ConfigError(f"{path}: {e.strerror}") from e
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == key:
+        data = cached[1]
+    else:
+        try:
+            with open(path, 'r') as file:
+                data = yaml.load(file, Loader=SafeLoader)
+        except yaml.YAMLError as e:
+            raise ConfigError(f"{path}: {e}") from e
+        _cache[path] = (key, data)
+
+    _validate(data, path, node_type, required)
+
+    return AlloraConfig(
+        path=path,
+        node_type=node_type,
+        name=data.get('name'),
+        network=data.get('network'),
+        faucet_url=data.get('faucet_url'),
+        node_public_ip=data.get('node_public_ip'),
+        node=NodeConfig.from_dict(data[node_type]),
+    )
+
+
+def _format_scalar(value):
+    # dumping inside a flow sequence yields a single-line scalar quoted only when yaml needs it
+    return yaml.safe_dump([value], default_flow_style=True, width=float('inf')).strip()[1:-1]
+
+
+def _split_comment(line):
+    """Split a line into its content and trailing ` # comment`, ignoring `#` inside quoted scalars."""
+    quote = None
+    for i, char in enumerate(line):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '\'"' and line[:i].rstrip().endswith((':', '-', '[', '{', ',')):
+            quote = char
+        elif char == '#' and (i == 0 or line[i - 1] in ' \t'):
+            content = line[:i].rstrip()
+            return content, line[len(content):].rstrip('\n')
+    return line.rstrip(), ''
+
+
+def _set_value(lines, section, key, value):
+    """Set `key` (under `section`, or top level when None) in place, keeping comments and layout."""
+    rendered = _format_scalar(value)
+
+    if section is None:
+        start, end, indent = 0, len(lines), ''
+    else:
+        header = f"{section}:"
+        start = next((i + 1 for i, line in enumerate(lines) if _split_comment(line)[0] == header), None)
+        if start is None:
+            lines.append(f"{header}\n")
+            start = len(lines)
+        end = start
+        while end < len(lines) and (not lines[end].strip() or lines[end][0] in ' \t'):
+            end += 1
+        indent = '  '
+        for line in lines[start:end]:
+            if line.strip() and not line.lstrip().startswith('#'):
+                indent = line[:len(line) - len(line.lstrip())]
+                break
+
+    prefix = f"{indent}{key}:"
+    for i in range(start, end):
+        if lines[i].startswith(prefix):
+            # a long scalar written by yaml.safe_dump continues on more-indented lines, replace them all
+            stop = i + 1
+            while stop < end and (not lines[stop].strip() or len(lines[stop]) - len(lines[stop].lstrip()) > len(indent)):
+                stop += 1
+            while stop > i + 1 and not lines[stop - 1].strip():
+                stop -= 1
+            comment = _split_comment(lines[i])[1]
+            lines[i:stop] = [f"{prefix} {rendered}{comment}\n"]
+            return
+
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    if end > 0 and not lines[end - 1].endswith('\n'):
+        lines[end - 1] += '\n'
+    lines.insert(end, f"{prefix} {rendered}\n")
+
+
+def save_config(config: AlloraConfig):
+    """Write changed values back to config.yaml without dropping the template's comments."""
+    with open(config.path, 'r') as file:
+        lines = file.readlines()
+    current = yaml.load(''.join(lines), Loader=SafeLoader) or {}
+
+    for key in ('name', 'network', 'faucet_url', 'node_public_ip'):
+        value = getattr(config, key)
+        if current.get(key) != value:
+            _set_value(lines, None, key, value)
+
+    section = current.get(config.node_type) or {}
+    for field in fields(NodeConfig):
+        value = getattr(config.node, field.name)
+        if section.get(field.name) != value and not (value in (None, '') and field.name not in section):
+            _set_value(lines, config.node_type, field.name, value)
+
+    tmp_path = f"{config.path}.tmp"
+    with open(tmp_path, 'w') as file:
+        file.writelines(lines)
+    os.replace(tmp_path, config.path)
+    _cache.pop(config.path, None)
@@ -0,0 +1,135 @@
+import re
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from termcolor import cprint
+
+HEADS_URL = "https://raw.githubusercontent.com/allora-network/networks/main/{network}/heads.txt"
+MULTISTREAM_PROTOCOL = b'/multistream/1.0.0\n'
+DEFAULT_TIMEOUT = 3.0
+MAX_PROBE_WORKERS = 32
+
+
+@dataclass
+class HeadProbe:
+    """Outcome of dialing one head multiaddr; latencies are in milliseconds."""
+
+    __slots__ = ('multiaddr', 'reachable', 'handshake', 'connect_ms', 'total_ms', 'error')
+    multiaddr: str
+    reachable: bool
+    handshake: bool
+    connect_ms: float
+    total_ms: float
+    error: str
+
+
+def parse_heads(content):
+    """Split heads.txt content (comma and/or whitespace separated) into multiaddrs, keeping order."""
+    if not content:
+        return []
+    return [addr for addr in re.split(r'[,\s]+', content.strip()) if addr.startswith('/')]
+
+
+def parse_multiaddr(multiaddr):
+    """Return the (host, port) to dial for an /ip4, /ip6 or /dns* tcp multiaddr, or None."""
+    parts = multiaddr.strip('/').split('/')
+    if len(parts) < 4 or parts[0] not in ('ip4', 'ip6', 'dns', 'dns4', 'dns6') or parts[2] != 'tcp':
+        return None
+    try:
+        return parts[1], int(parts[3])
+    except ValueError:
+        return None
+
+
+def _encode_uvarint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _read_uvarint(sock):
+    value, shift = 0, 0
+    while True:
+        byte = sock.recv(1)
+        if not byte:
+            raise ConnectionError("connection closed during handshake")
+        value |= (byte[0] & 0x7f) << shift
+        if not byte[0] & 0x80:
+            return value
+        shift += 7
+
+
+def _read_exactly(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed during handshake")
+        data += chunk
+    return data
+
+
+def probe_head(multiaddr, timeout=DEFAULT_TIMEOUT):
+    """Time a TCP connect plus the libp2p multistream-select opening exchange with one head."""
+    target = parse_multiaddr(multiaddr)
+    if target is None:
+        return HeadProbe(multiaddr, False, False, None, None, "unsupported multiaddr")
+
+    start = time.perf_counter()
+    try:
+        with socket.create_connection(target, timeout=timeout) as sock:
+            connected = time.perf_counter()
+            connect_ms = (connected - start) * 1000
+            try:
+                sock.sendall(_encode_uvarint(len(MULTISTREAM_PROTOCOL)) + MULTISTREAM_PROTOCOL)
+                reply = _read_exactly(sock, _read_uvarint(sock))
+            except OSError as e:
+                return HeadProbe(multiaddr, True, False, connect_ms, connect_ms, f"handshake failed: {e}")
+            total_ms = (time.perf_counter() - start) * 1000
+            if not reply.startswith(b'/multistream/'):
+                return HeadProbe(multiaddr, True, False, connect_ms, total_ms, "unexpected handshake reply")
+            return HeadProbe(multiaddr, True, True, connect_ms, total_ms, None)
+    except OSError as e:
+        return HeadProbe(multiaddr, False, False, None, None, str(e) or type(e).__name__)
+
+
+def probe_heads(multiaddrs, timeout=DEFAULT_TIMEOUT):
+    """Probe all heads concurrently and return them best-first.
+
+    Heads completing the handshake come first, then heads that only accepted the TCP
+    connection, each group ordered by latency; unreachable heads are listed last.
+    """
+    if not multiaddrs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(multiaddrs), MAX_PROBE_WORKERS)) as executor:
+        probes = list(executor.map(lambda addr: probe_head(addr, timeout), multiaddrs))
+    return sorted(probes, key=lambda probe: (not probe.reachable, not probe.handshake, probe.total_ms or 0))
+
+
+def select_boot_nodes(heads_content, timeout=DEFAULT_TIMEOUT):
+    """Rank the heads by latency and return them as a best-first --boot-nodes list without unreachable ones.
+
+    When no head can be reached (e.g. generating offline) the original list is kept so the
+    generated files are still usable once the network is available.
+    """
+    multiaddrs = parse_heads(heads_content)
+    if not multiaddrs:
+        return heads_content
+
+    cprint(f"Probing {len(multiaddrs)} head nodes for latency...", 'cyan')
+    reachable = [probe.multiaddr for probe in probe_heads(multiaddrs, timeout) if probe.reachable]
+    if not reachable:
+        cprint("No head node could be reached, keeping the heads in their original order", 'yellow')
+        return ','.join(multiaddrs)
+
+    dropped = len(multiaddrs) - len(reachable)
+    if dropped:
+        cprint(f"Dropped {dropped} unreachable head node(s) from the boot nodes", 'yellow')
+    return ','.join(reachable)
@@ -0,0 +1,169 @@
+import os
+import re
+import json
+import base64
+import hashlib
+import sqlite3
+from functools import lru_cache
+from dataclasses import dataclass, asdict
+from cryptography.fernet import Fernet, InvalidToken
+
+KEYSTORE_ENV = 'ALLOCMD_KEYSTORE'
+PASSPHRASE_ENV = 'ALLOCMD_KEYSTORE_PASSPHRASE'
+DEFAULT_KEYSTORE_PATH = os.path.join(os.path.expanduser('~'), '.allocmd', 'keystore.db')
+
+_CHECK_TOKEN = b'allocmd-keystore'
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS keys (
+    handle TEXT PRIMARY KEY,
+    address TEXT NOT NULL,
+    secret BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class KeystoreError(Exception):
+    """Raised when the keystore cannot be opened or a handle is unknown."""
+
+
+@dataclass
+class KeyEntry:
+    """The account material of one node, stored under its handle."""
+
+    __slots__ = ('handle', 'address', 'mnemonic', 'hex_coded_pk')
+    handle: str
+    address: str
+    mnemonic: str
+    hex_coded_pk: str
+
+
+def key_handle(name, type):
+    """The handle a node's keys are stored under, matching the former <name>.<type>.key file name."""
+    return f"{name}.{type}"
+
+
+def k8s_secret_name(handle):
+    """Kubernetes secret name for a handle (lowercase RFC 1123 subdomain)."""
+    return re.sub(r'[^a-z0-9.-]', '-', handle.lower()).strip('.-')
+
+
+def keystore_path():
+    return os.environ.get(KEYSTORE_ENV) or DEFAULT_KEYSTORE_PATH
+
+
+@lru_cache(maxsize=8)
+def _derive_key(passphrase, salt):
+    # scrypt is deliberately slow; remember the result so generating a fleet pays for it once
+    raw = hashlib.scrypt(passphrase.encode(), salt=salt, n=2 ** 14, r=8, p=1, dklen=32)
+    return base64.urlsafe_b64encode(raw)
+
+
+class Keystore:
+    """Encrypted single-file (SQLite) store of node keys, indexed by handle.
+
+    Addresses are kept in clear so handles can be listed without the passphrase; mnemonics
+    and private keys are encrypted with a key derived from the passphrase by scrypt.
+    """
+
+    def __init__(self, path, passphrase):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        os.chmod(path, 0o600)
+        self._db.executescript(_SCHEMA)
+        self._fernet = self._unlock(passphrase) if passphrase is not None else None
+
+    def _unlock(self, passphrase):
+        rows = dict(self._db.execute("SELECT name, value FROM meta"))
+        if 'salt' not in rows:
+            salt = os.urandom(16)
+            fernet = Fernet(_derive_key(passphrase, salt))
+            with self._db:
+                self._db.executemany("INSERT INTO meta (name, value) VALUES (?, ?)", [
+                    ('salt', salt),
+                    ('check', fernet.encrypt(_CHECK_TOKEN)),
+                ])
+            return fernet
+
+        fernet = Fernet(_derive_key(passphrase, rows['salt']))
+        try:
+            fernet.decrypt(rows['check'])
+        except InvalidToken:
+            raise KeystoreError(f"wrong passphrase for keystore {self.path}")
+        return fernet
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _require_unlocked(self):
+        if self._fernet is None:
+            raise KeystoreError("keystore is locked, a passphrase is required")
+
+    def _encrypt(self, entry: KeyEntry):
+        return self._fernet.encrypt(json.dumps([entry.mnemonic, entry.hex_coded_pk]).encode())
+
+    def put(self, entry: KeyEntry):
+        self.put_many([entry])
+
+    def put_many(self, entries):
+        """Insert or replace many entries in one transaction; returns how many were written."""
+        self._require_unlocked()
+        rows = [(entry.handle, entry.address, self._encrypt(entry)) for entry in entries]
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO keys (handle, address, secret) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    def get(self, handle):
+        self._require_unlocked()
+        row = self._db.execute("SELECT address, secret FROM keys WHERE handle = ?", (handle,)).fetchone()
+        if row is None:
+            raise KeystoreError(f"no keys stored under handle '{handle}' in {self.path}")
+        return self._decrypt(handle, *row)
+
+    def _decrypt(self, handle, address, secret):
+        try:
+            mnemonic, hex_coded_pk = json.loads(self._fernet.decrypt(secret))
+        except InvalidToken:
+            raise KeystoreError(f"cannot decrypt keys of '{handle}'")
+        return KeyEntry(handle, address, mnemonic, hex_coded_pk)
+
+    def __contains__(self, handle):
+        return self._db.execute("SELECT 1 FROM keys WHERE handle = ?", (handle,)).fetchone() is not None
+
+    def delete(self, handle):
+        with self._db:
+            return self._db.execute("DELETE FROM keys WHERE handle = ?", (handle,)).rowcount > 0
+
+    def addresses(self):
+        """Yield (handle, address) pairs without decrypting anything."""
+        yield from self._db.execute("SELECT handle, address FROM keys ORDER BY handle")
+
+    def export_entries(self, handles=None):
+        """Yield decrypted entries, all of them or only the given handles."""
+        self._require_unlocked()
+        if handles is None:
+            for row in self._db.execute("SELECT handle, address, secret FROM keys ORDER BY handle"):
+                yield self._decrypt(*row)
+        else:
+            for handle in handles:
+                yield self.get(handle)
+
+    def import_jsonl(self, file):
+        """Bulk import entries from JSON lines with handle, address, mnemonic and hex_coded_pk keys."""
+        return self.put_many(KeyEntry(**json.loads(line)) for line in file if line.strip())
+
+    def export_jsonl(self, file, handles=None):
+        count = 0
+        for entry in self.export_entries(handles):
+            file.write(json.dumps(asdict(entry)) + '\n')
+            count += 1
+        return count
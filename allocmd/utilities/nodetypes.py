@@ -0,0 +1,143 @@
+import sys
+from dataclasses import dataclass
+from termcolor import cprint
+
+ENTRY_POINT_GROUP = 'allocmd.node_types'
+
+_registry = {}
+_discovered = False
+
+
+@dataclass
+class NodeTypeSpec:
+    """Everything the generate pipeline needs to know about one kind of blockless node.
+
+    `key_steps` are (step name, callable(name, type)) pairs run through the checkpointed
+    pipeline before the files are written, their results are handed to `build_context`,
+    a callable(spec, context, results) returning the template context (see `template_context`).
+    `metrics_port` is the host port the node's metrics endpoint is published on in production.
+    `hooks` maps an event ('post_generate', 'post_prod') to callables(node_dir, context).
+    """
+
+    __slots__ = ('name', 'role', 'dev_port', 'prod_port', 'metrics_port', 'dev_templates', 'prod_templates', 'build_context', 'key_steps', 'hooks')
+    name: str
+    role: str
+    dev_port: int
+    prod_port: int
+    metrics_port: int
+    dev_templates: tuple
+    prod_templates: tuple
+    build_context: object
+    key_steps: tuple
+    hooks: dict
+
+    def topic(self, topic_id):
+        return f"allora-topic-{topic_id}-{self.name}"
+
+    def template_context(self, context, results):
+        return self.build_context(self, context, results)
+
+    def run_hooks(self, event, node_dir, context):
+        for hook in self.hooks.get(event, ()):
+            hook(node_dir, context)
+
+
+def default_context(spec: NodeTypeSpec, context, results):
+    """Template context shared by the built-in node types."""
+    return {
+        **context,
+        "b7s_type": spec.name,
+        "role": spec.role,
+        "head_peer_id": results.get('keys'),
+        "allora_topic_id": spec.topic(context["topic_id"]),
+    }
+
+
+def register_node_type(spec: NodeTypeSpec, replace=False):
+    if spec.name in _registry and not replace:
+        raise ValueError(f"node type '{spec.name}' is already registered")
+    _registry[spec.name] = spec
+    return spec
+
+
+def _entry_points():
+    from importlib import metadata
+    if sys.version_info >= (3, 10):
+        return metadata.entry_points(group=ENTRY_POINT_GROUP)
+    return metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+
+
+def _discover():
+    global _discovered
+    if _discovered:
+        return
+    _discovered = True
+    _register_builtins()
+    for entry_point in _entry_points():
+        try:
+            spec = entry_point.load()
+            register_node_type(spec() if callable(spec) else spec)
+        except Exception as e:
+            cprint(f"Could not load node type plugin '{entry_point.name}': {e}", 'yellow')
+
+
+def get_node_type(name) -> NodeTypeSpec:
+    _discover()
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ValueError(f"unknown node type '{name}', available: {', '.join(sorted(_registry))}") from None
+
+
+def node_types():
+    _discover()
+    return dict(_registry)
+
+
+def _register_builtins():
+    from .utils import run_key_generate_command
+
+    common_dev_templates = (
+        ("Dockerfile.j2", "Dockerfile"),
+        ("dev-docker-compose.yaml.j2", "dev-docker-compose.yaml"),
+        ("gitignore.j2", ".gitignore"),
+        ("env.j2", ".env"),
+        ("config.yaml.j2", "config.yaml"),
+    )
+    prod_templates = (
+        ("prod-docker-compose.yaml.j2", "prod-docker-compose.yaml"),
+        ("init.sh.j2", "data/scripts/init.sh"),
+        ("update-node-ip.sh.j2", "update-node-ip.sh"),
+    )
+    key_steps = (('keys', run_key_generate_command),)
+
+    register_node_type(NodeTypeSpec(
+        name='worker',
+        role='worker',
+        dev_port=9011,
+        prod_port=9010,
+        metrics_port=2112,
+        dev_templates=common_dev_templates + (
+            ("main.py.j2", "main.py"),
+            ("requirements.txt.j2", "requirements.txt"),
+        ),
+        prod_templates=prod_templates,
+        build_context=default_context,
+        key_steps=key_steps,
+        hooks={},
+    ))
+    register_node_type(NodeTypeSpec(
+        name='reputer',
+        role='worker',
+        dev_port=9012,
+        prod_port=9011,
+        metrics_port=2113,
+        dev_templates=common_dev_templates + (
+            ("reputer-main.py.j2", "main.py"),
+            ("reputer-requirements.txt.j2", "requirements.txt"),
+        ),
+        prod_templates=prod_templates,
+        build_context=default_context,
+        key_steps=key_steps,
+        hooks={},
+    ))
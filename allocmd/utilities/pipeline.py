@@ -0,0 +1,98 @@
+import os
+import json
+import hashlib
+import yaml
+from termcolor import cprint
+
+STATE_FILE = '.allocmd-state.yaml'
+
+
+class PipelineError(Exception):
+    """Raised when a pipeline step fails; the checkpoint keeps every step completed before it."""
+
+    def __init__(self, step, reason=None):
+        self.step = step
+        self.reason = reason
+        message = f"step '{step}' failed"
+        if reason:
+            message = f"{message}: {reason}"
+        super().__init__(message)
+
+
+def fingerprint(*args, **kwargs):
+    """Short digest of a step's inputs, so a checkpoint is only reused for the same inputs."""
+    payload = json.dumps([args, kwargs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class Pipeline:
+    """Runs named steps once, checkpointing each completed step into the node directory.
+
+    The checkpoint is a small yaml file holding one section per pipeline (dev, prod, deploy...)
+    so re-running a command skips what already succeeded and resumes at the step that failed.
+    Each checkpoint records a fingerprint of the step's arguments and the step runs again when
+    they change. Cheap steps whose output depends on files or flags (rendering templates,
+    helm upgrades) are run with `checkpoint=False` so they are redone on every run.
+    A step fails when it raises or returns None, which is how the helpers in utils report errors.
+    """
+
+    def __init__(self, node_dir, name):
+        self.node_dir = node_dir
+        self.name = name
+        self.state_path = os.path.join(node_dir, STATE_FILE)
+        self._state = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r') as file:
+                state = yaml.safe_load(file)
+        except yaml.YAMLError:
+            cprint(f"Ignoring unreadable checkpoint file {self.state_path}", 'yellow')
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _save(self):
+        os.makedirs(self.node_dir, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as file:
+            yaml.safe_dump(self._state, file)
+        os.replace(tmp_path, self.state_path)
+
+    @property
+    def steps(self):
+        return self._state.setdefault(self.name, {})
+
+    def is_done(self, step, inputs=None):
+        entry = self.steps.get(step)
+        return isinstance(entry, dict) and 'result' in entry and (inputs is None or entry.get('inputs') == inputs)
+
+    def result(self, step, default=None):
+        return self.steps[step]['result'] if self.is_done(step) else default
+
+    def has_progress(self):
+        return bool(self._state.get(self.name))
+
+    def run(self, step, func, *args, checkpoint=True, **kwargs):
+        """Run `func` unless `step` is already checkpointed with the same arguments, returning the (stored) result."""
+        inputs = fingerprint(*args, **kwargs)
+        if checkpoint and self.is_done(step, inputs):
+            cprint(f"Skipping '{step}', already completed", 'cyan')
+            return self.steps[step]['result']
+
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            raise PipelineError(step, e) from e
+        if result is None:
+            raise PipelineError(step)
+
+        if checkpoint:
+            self.steps[step] = {'inputs': inputs, 'result': result}
+            self._save()
+        return result
+
+    def reset(self):
+        self._state.pop(self.name, None)
+        self._save()
@@ -0,0 +1,65 @@
+import time
+import ipaddress
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
+
+# IPv4-only endpoints: urllib cannot be told which address family to use, and a dual-stack
+# source reached over IPv6 would answer with an address that is not a valid dialback address
+IP_SOURCES = (
+    'https://api4.ipify.org',
+    'https://ipv4.icanhazip.com',
+    'https://checkip.amazonaws.com',
+    'https://v4.ident.me',
+)
+DEFAULT_TIMEOUT = 3.0
+CACHE_TTL = 300
+
+_cache = {}
+
+
+def _fetch(url, timeout):
+    request = urllib.request.Request(url, headers={'User-Agent': 'curl/8', 'Accept': 'text/plain'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.read(64).decode().strip()
+
+
+def _query(url, timeout):
+    try:
+        return str(ipaddress.IPv4Address(_fetch(url, timeout)))
+    except (OSError, ValueError):
+        return None
+
+
+def discover_public_ip(timeout=DEFAULT_TIMEOUT, sources=IP_SOURCES, refresh=False):
+    """Race the IP sources and return the first address two of them agree on.
+
+    If the sources disagree or only one answers before `timeout`, the most common answer is
+    used. Results are cached for CACHE_TTL seconds unless `refresh` is set; returns None when
+    no source answers.
+    """
+    cached = _cache.get(sources)
+    if cached and not refresh and time.monotonic() - cached[1] < CACHE_TTL:
+        return cached[0]
+
+    answers = Counter()
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    try:
+        futures = [executor.submit(_query, url, timeout) for url in sources]
+        for future in as_completed(futures, timeout=timeout + 1):
+            ip = future.result()
+            if ip is None:
+                continue
+            answers[ip] += 1
+            if answers[ip] >= 2:
+                break
+    except TimeoutError:
+        pass
+    finally:
+        executor.shutdown(wait=False)
+
+    if not answers:
+        return None
+    ip = answers.most_common(1)[0][0]
+    _cache[sources] = (ip, time.monotonic())
+    return ip
@@ -1,4 +1,5 @@
 import os
+import sys
 import click
 import subprocess
 from jinja2 import Environment
@@ -7,9 +8,100 @@ from termcolor import colored, cprint
 import time
 import shutil 
 from .typings import Command, BlocklessNodeType
+from .pipeline import Pipeline, PipelineError
+from .config import ConfigError, load_config, save_config
+from .heads import HEADS_URL, select_boot_nodes
+from .nodetypes import get_node_type, node_types
+from .publicip import discover_public_ip
+from .keystore import Keystore, KeyEntry, KeystoreError, PASSPHRASE_ENV, key_handle, k8s_secret_name, keystore_path
+import json
 import re
 import yaml
 
+def confirm(message, assume_yes=False):
+    """Ask for confirmation unless running non-interactively with --yes."""
+    if assume_yes:
+        cprint(f"{message} [auto-confirmed with --yes]", 'white', attrs=['bold'])
+        return True
+    return click.confirm(colored(message, 'white', attrs=['bold']), default=True)
+
+def abort_pipeline(error: PipelineError, pipeline: Pipeline):
+    """Report a failed step and exit with status 1, so scripted rollouts can detect it and retry."""
+    cprint(f"\n{error}", 'red', attrs=['bold'])
+    cprint(f"Completed steps are saved in {pipeline.state_path}, re-run the same command to resume from '{error.step}'", 'yellow')
+    raise click.exceptions.Exit(1)
+
+def open_keystore(path=None):
+    """Open the keystore, taking the passphrase from ALLOCMD_KEYSTORE_PASSPHRASE or prompting for it."""
+    path = path or keystore_path()
+    passphrase = os.environ.get(PASSPHRASE_ENV)
+    if passphrase is None:
+        if not sys.stdin.isatty():
+            raise KeystoreError(f"set {PASSPHRASE_ENV} to unlock the keystore non-interactively")
+        is_new = not os.path.exists(path)
+        passphrase = click.prompt(colored(f"Keystore passphrase ({path})", 'white', attrs=['bold']), hide_input=True, confirmation_prompt=is_new)
+    return Keystore(path, passphrase)
+
+def store_account_keys(config, keystore: Keystore):
+    """Move the account of `config` into the keystore, leaving only its handle and address in config.yaml.
+
+    Configs written by earlier versions keep the mnemonic and private key inline, they are
+    migrated here the first time they are used.
+    """
+    if config.node.key_handle:
+        return config.node.key_handle
+
+    handle = key_handle(config.name, config.node_type)
+    keystore.put(KeyEntry(handle, config.node.address, config.node.mnemonic, config.node.hex_coded_pk))
+    config.node.key_handle = handle
+    config.node.mnemonic = ''
+    config.node.hex_coded_pk = ''
+    save_config(config)
+    cprint(f"account keys of '{config.name}' stored in the keystore under handle '{handle}'", 'green')
+    return handle
+
+def load_account_keys(config):
+    with open_keystore() as keystore:
+        return keystore.get(store_account_keys(config, keystore))
+
+# uid the allora-chain image runs as, the same as runAsUser in the helm values
+CONTAINER_UID = 1001
+
+def write_compose_secret(handle, entry: KeyEntry):
+    """Materialize the private key for docker compose secrets, readable only by the owner.
+
+    File based compose secrets are bind mounts keeping the host owner and mode, so the file
+    has to belong to the uid of the container reading it.
+    """
+    os.makedirs('secrets', mode=0o700, exist_ok=True)
+    secret_path = os.path.join('secrets', f'{handle}.hex')
+    fd = os.open(secret_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as file:
+        file.write(entry.hex_coded_pk)
+
+    if os.geteuid() == 0:
+        os.chown(secret_path, CONTAINER_UID, -1)
+    elif os.geteuid() != CONTAINER_UID:
+        cprint(f"the init container runs as uid {CONTAINER_UID} and cannot read {secret_path} yet, run: sudo chown {CONTAINER_UID} {secret_path}", 'yellow')
+    return secret_path
+
+def apply_k8s_secret(entry: KeyEntry):
+    """Create or update the kubernetes secret the helm values reference by handle."""
+    manifest = {
+        "apiVersion": "v1",
+        "kind": "Secret",
+        "type": "Opaque",
+        "metadata": {"name": k8s_secret_name(entry.handle)},
+        "stringData": {"hex_coded_pk": entry.hex_coded_pk, "mnemonic": entry.mnemonic},
+    }
+    try:
+        subprocess.run(["kubectl", "apply", "-f", "-"], input=json.dumps(manifest), text=True, check=True, stdout=subprocess.DEVNULL)
+        print(colored(f"Kubernetes secret '{k8s_secret_name(entry.handle)}' applied.", 'green'))
+        return entry.handle
+    except subprocess.CalledProcessError as e:
+        print(colored(f"Failed to apply kubernetes secret: {e}", 'red'))
+        return
+
 def create_worker_account(worker_name, faucet_url, type, network="edgenet"):
     current_file_dir = os.path.dirname(os.path.abspath(__file__))
     cli_tool_dir = os.path.dirname(current_file_dir)
@@ -44,18 +136,14 @@ def create_worker_account(worker_name, faucet_url, type, network="edgenet"):
                         cwd=allora_chain_dir, 
                         check=True)
 
-        key_path = os.path.join(os.getcwd(), f'{worker_name}.{type}.key')
-        with open(key_path, 'w') as file:
-            subprocess.run(['allorad', 'keys', 'add', worker_name, '--keyring-backend', 'test'], 
-                            cwd=allora_chain_dir,
-                            env=env, 
-                            stdout=file, 
-                            stderr=subprocess.STDOUT, 
-                            check=True)
-
-        with open(key_path, 'r') as file:
-            content = file.read()
-            lines = content.splitlines()
+        content = subprocess.run(['allorad', 'keys', 'add', worker_name, '--keyring-backend', 'test'], 
+                                 cwd=allora_chain_dir,
+                                 env=env, 
+                                 stdout=subprocess.PIPE, 
+                                 stderr=subprocess.STDOUT, 
+                                 text=True,
+                                 check=True).stdout
+        lines = content.splitlines()
 
         address = re.search(r'address: (\w+)', content).group(1)
         mnemonic = lines[-1].strip()
@@ -70,8 +158,6 @@ def create_worker_account(worker_name, faucet_url, type, network="edgenet"):
         hex_pk_result, errors = process.communicate(input='y\n')
         
         hex_coded_pk = hex_pk_result.strip()
-        with open(key_path, "a") as file:
-            file.write(f"\nHEX-CODED PRIVATE KEY: \n{hex_coded_pk}")
 
         subprocess.run([
                         'curl',
@@ -79,11 +165,11 @@ def create_worker_account(worker_name, faucet_url, type, network="edgenet"):
                         f'{faucet_url}send/{network}/{address}'
                     ], stdout=subprocess.DEVNULL)
         
-        print(colored(f"keys created and {network}-funded for this {type}. please check config.yaml for your address and mnemonic", "green"))
+        print(colored(f"keys created and {network}-funded for this {type}. your mnemonic and private key will be saved in the keystore", "green"))
         return mnemonic, hex_coded_pk, address
     else:
         print(colored("'make' is not available in the system's PATH. Please install it or check your PATH settings.", "red"))
-        return ''
+        return
 
 def fetch_content_with_curl(url):
     try:
@@ -100,9 +186,9 @@ def fundAddress(faucet_url, address, network):
     try:
         subprocess.run([
                         'curl',
-                        '-L',
+                        '-fL',
                         f'{faucet_url}send/{network}/{address}'
-                    ], stdout=subprocess.DEVNULL)
+                    ], stdout=subprocess.DEVNULL, check=True)
         
         print(colored(f"address funded with {network}-faucet", "green"))
         return address
@@ -125,11 +211,12 @@ def print_allora_banner():
     """
     cprint(banner_text, 'blue', attrs=['bold'])
 
-def generate_all_files(env: Environment, file_configs, command: Command, type, name = ''):
+def generate_all_files(env: Environment, file_configs, command: Command, type='', name = ''):
     if command == Command.INIT:
         cprint(f"Bootstraping '{name}' directory...", 'cyan')
         time.sleep(1) 
 
+    file_paths = []
     for config in file_configs:
         template = env.get_template(config["template_name"])
 
@@ -141,13 +228,17 @@ def generate_all_files(env: Environment, file_configs, command: Command, type, n
         content = template.render(**config["context"])
         with open(file_path, 'w') as f:
             f.write(content)
+        file_paths.append(file_path)
 
     if command == Command.INIT:
         cprint("\nAll files bootstrapped successfully. ALLORA!!!", 'green', attrs=['bold'])
 
+    return file_paths
+
 def run_key_generate_command(worker_name, type):
+    tty_flags = '-it' if sys.stdin.isatty() else '-i'
     command = (
-        f'docker run -it --entrypoint=bash -v "$(pwd)/{worker_name}/{type}/data":/data '
+        f'docker run {tty_flags} --entrypoint=bash -v "$(pwd)/{worker_name}/{type}/data":/data '
         'alloranetwork/allora-inference-base:latest '
         f'-c "mkdir -p /data/head/key /data/{type}/key && (cd /data/head/key && allora-keys) && (cd /data/{type}/key && allora-keys)"'
     )
@@ -161,49 +252,140 @@ def run_key_generate_command(worker_name, type):
     except subprocess.CalledProcessError as e:
         click.echo(f"error generating local {type} identity: {e}", err=True)
 
-def generateWorkerAccount(worker_name, type):
-    config_path = os.path.join(os.getcwd(), worker_name, type, 'config.yaml')
+def generateWorkerAccount(worker_name, type, config_path=None):
+    if config_path is None:
+        config_path = os.path.join(os.getcwd(), worker_name, type, 'config.yaml')
     try:
-        with open(config_path, 'r') as file:
-            config = yaml.safe_load(file)
-    except yaml.YAMLError as e:
+        config = load_config(config_path, type)
+    except ConfigError as e:
         print(colored(f"Error reading config file: {e}", 'red', attrs=['bold']))
         return
 
-    worker_name = config['name']
-    faucet_url = config['faucet_url']
-    account_details = None
-    if not config[type]['mnemonic'] or not config[type]['hex_coded_pk'] or not config[type]['address']:
-        account_details = create_worker_account(worker_name, faucet_url, type)
+    if config.node.key_handle and config.node.address:
+        return config.node.address
 
-    mnemonic = account_details[0] if account_details else config[type]['mnemonic']
-    hex_coded_pk = account_details[1] if account_details else config[type]['hex_coded_pk']
-    address = account_details[2] if account_details else config[type]['address']
+    try:
+        with open_keystore() as keystore:
+            if not config.node.has_account():
+                account_details = create_worker_account(config.name, config.faucet_url, type)
+                if not account_details:
+                    return
+                config.node.mnemonic, config.node.hex_coded_pk, config.node.address = account_details
+                config.node.key_handle = None
+            store_account_keys(config, keystore)
+    except KeystoreError as e:
+        print(colored(f"Keystore error: {e}", 'red', attrs=['bold']))
+        return
 
-    if not config[type]['mnemonic'] or not config[type]['hex_coded_pk'] or not config[type]['address']:
-        config[type]['mnemonic'] = mnemonic
-        config[type]['hex_coded_pk'] = hex_coded_pk
-        config[type]['address'] = address
-        with open(config_path, 'w') as file:
-            yaml.safe_dump(config, file)
+    return config.node.address
 
-    return address
+def get_public_ip(refresh=False):
+    public_ip = discover_public_ip(refresh=refresh)
+    if public_ip is None:
+        click.echo("error getting public IP: no IP source answered", err=True)
+    return public_ip
 
-def get_public_ip():
-    try:
-        result = subprocess.run(['curl', '-4', '-s', 'http://icanhazip.com'], capture_output=True, text=True, check=True)
-        public_ip = result.stdout.strip()
-        return public_ip
-    except subprocess.CalledProcessError as e:
-        click.echo(f"error getting public IP: {e}", err=True)
-        return None
+DIALBACK_ADDRESS = re.compile(r'(--dialback-address=)(\S+)')
+
+def updateNodeIp(public_ip, compose_file='prod-docker-compose.yaml'):
+    """Point --dialback-address and node_public_ip at `public_ip`, returning the compose services to restart."""
+
+    with open(compose_file, 'r') as file:
+        compose = file.read()
+
+    services = [
+        service_name
+        for service_name, service in (yaml.safe_load(compose).get('services') or {}).items()
+        if any(DIALBACK_ADDRESS.match(str(arg)) for arg in service.get('command') or [])
+    ]
+
+    tmp_path = f"{compose_file}.tmp"
+    with open(tmp_path, 'w') as file:
+        file.write(DIALBACK_ADDRESS.sub(lambda match: match.group(1) + public_ip, compose))
+    os.replace(tmp_path, compose_file)
+
+    config_path = os.path.join(os.path.dirname(os.path.abspath(compose_file)), 'config.yaml')
+    if os.path.exists(config_path):
+        for type in node_types():
+            try:
+                config = load_config(config_path, type)
+            except ConfigError:
+                continue
+            config.node_public_ip = public_ip
+            save_config(config)
+            break
+
+    return services
+
+def currentDialbackAddress(compose_file='prod-docker-compose.yaml'):
+    with open(compose_file, 'r') as file:
+        match = DIALBACK_ADDRESS.search(file.read())
+    return match.group(2) if match else None
+
+def restartComposeServices(compose_file, services):
+    """Recreate `services` with docker-compose, falling back to the `docker compose` plugin."""
+    for command in (['docker-compose'], ['docker', 'compose']):
+        try:
+            subprocess.run([*command, '-f', compose_file, 'up', '-d', '--no-deps', *services], check=True)
+            return True
+        except FileNotFoundError:
+            continue
+        except subprocess.CalledProcessError as e:
+            cprint(f"error restarting {', '.join(services)}: {e}", 'red')
+            return False
+    cprint("error restarting containers: neither docker-compose nor docker compose is installed", 'red')
+    return False
+
+def watchNodeIp(interval, once=False, compose_file='prod-docker-compose.yaml'):
+    """Keep the node dialback address in sync with the public IP, restarting only the affected containers.
+
+    A restart that fails is retried on every interval until it succeeds, since the compose file
+    already holds the new address. With `once`, exits with status 1 when the IP cannot be
+    discovered or the containers cannot be restarted, so cron can report it.
+    """
 
-def generateProdCompose(env: Environment, type, network):
+    if not os.path.exists(compose_file):
+        cprint(f"{compose_file} not found, run this command in your node directory after generating it with --env prod", 'red')
+        raise click.exceptions.Exit(1)
+
+    if currentDialbackAddress(compose_file) is None:
+        cprint(f"no --dialback-address found in {compose_file}, regenerate it with --env prod", 'red')
+        raise click.exceptions.Exit(1)
+
+    if not once:
+        cprint(f"Watching the public IP every {interval}s (press Ctrl-C to stop)...", 'cyan')
+    pending = []
+    try:
+        while True:
+            public_ip = get_public_ip(refresh=True)
+            current_ip = currentDialbackAddress(compose_file)
+            if public_ip and public_ip != current_ip:
+                cprint(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] public IP changed from {current_ip} to {public_ip}", 'yellow')
+                pending = sorted(set(pending) | set(updateNodeIp(public_ip, compose_file)))
+            elif once and public_ip and not pending:
+                cprint(f"public IP {public_ip} is up to date", 'green')
+
+            if pending:
+                if restartComposeServices(compose_file, pending):
+                    cprint(f"restarted {', '.join(pending)} with the new dialback address", 'green')
+                    pending = []
+                elif not once:
+                    cprint(f"will retry restarting {', '.join(pending)} in {interval}s", 'yellow')
+
+            if once:
+                if public_ip is None or pending:
+                    raise click.exceptions.Exit(1)
+                return public_ip
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        cprint("\nStopped watching the public IP.", 'cyan')
+
+def generateProdCompose(env: Environment, type, network, assume_yes=False):
     """Deploy resource production kubernetes cluster"""
 
     cprint(f"\nMake sure you are running this command in the appropriate directory [validator, reputer, worker]", 'cyan')
     cprint(f"\nif not, please cd to the right directory", 'cyan')
-    if click.confirm(colored("\nif you are in the right folder, please proceed", 'white', attrs=['bold']), default=True):
+    if confirm("\nif you are in the right folder, please proceed", assume_yes):
 
         subprocess.run("mkdir -p ./data/scripts", shell=True, check=True)
 
@@ -216,59 +398,54 @@ def generateProdCompose(env: Environment, type, network):
 
         config_path = os.path.join(os.getcwd(), 'config.yaml')
         try:
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
-        except yaml.YAMLError as e:
+            config = load_config(config_path, type, required=('allora_heads', 'allora_rpc_address', 'topic_id', 'address'))
+        except ConfigError as e:
             print(colored(f"Error reading config file: {e}", 'red', attrs=['bold']))
             return
 
-        worker_name = config['name']
-        faucet_url = config['faucet_url']
-        hex_coded_pk = config[type]['hex_coded_pk']
-        boot_nodes = config[type]['allora_heads'] # concatenate the created head nodes to this as well
-        allora_rpc_address = config[type]['allora_rpc_address']
-        chain_topic_id = config[type]['topic_id']
-        account_address = config[type]['address']
-
-        node_ip = get_public_ip()
-
-        alloraTopic = None
-        if type == 'worker':
-            alloraTopic = f"allora-topic-{chain_topic_id}-worker"
-        elif type == 'reputer':
-            alloraTopic = f"allora-topic-{chain_topic_id}-reputer"
-
-        file_configs = [
-            {
-                "template_name": "prod-docker-compose.yaml.j2",
-                "file_name": "prod-docker-compose.yaml",
-                "context": {
-                    "worker_name": worker_name, 
-                    "boot_nodes": boot_nodes, 
-                    "allora_rpc_address": allora_rpc_address, 
-                    "allora_topic_id": alloraTopic, 
-                    "topic_id": chain_topic_id, 
-                    "node_ip": node_ip
-                }
-            },
-            {
-                "template_name": "init.sh.j2",
-                "file_name": "data/scripts/init.sh",
-                "context": {
-                    "worker_name": worker_name, 
-                    "hex_coded_pk": hex_coded_pk
-                }
-            },
-            {
-                "template_name": "update-node-ip.sh.j2",
-                "file_name": "update-node-ip.sh",
-                "context": {}
-            }
-        ]
+        worker_name = config.name
+        faucet_url = config.faucet_url
+        allora_rpc_address = config.node.allora_rpc_address
+        chain_topic_id = config.node.topic_id
+        account_address = config.node.address
+        spec = get_node_type(type)
 
-        generate_all_files(env, file_configs, Command.DEPLOY, type)
+        def write_prod_files():
+            node_ip = get_public_ip()
+            if node_ip is None:
+                return None
+
+            boot_nodes = select_boot_nodes(config.node.allora_heads) # concatenate the created head nodes to this as well
+
+            account = load_account_keys(config)
+            write_compose_secret(account.handle, account)
+
+            context = spec.template_context({
+                "worker_name": worker_name, 
+                "boot_nodes": boot_nodes, 
+                "allora_rpc_address": allora_rpc_address, 
+                "topic_id": chain_topic_id, 
+                "node_ip": node_ip,
+                "port": spec.prod_port,
+                "metrics_port": spec.metrics_port,
+                "key_handle": account.handle
+            }, {})
+            file_configs = [
+                {"template_name": template_name, "file_name": file_name, "context": context}
+                for template_name, file_name in spec.prod_templates
+            ]
+
+            file_paths = generate_all_files(env, file_configs, Command.DEPLOY, type)
+            spec.run_hooks('post_prod', os.getcwd(), context)
+            return file_paths
+
+        pipeline = Pipeline(os.getcwd(), 'prod')
+        try:
+            pipeline.run('compose', write_prod_files, checkpoint=False)
+            pipeline.run('fund', fundAddress, faucet_url, account_address, network)
+        except PipelineError as e:
+            abort_pipeline(e, pipeline)
 
-        fundAddress(faucet_url, account_address, network)
         cprint(f"production docker compose file generated to be deployed", 'green')
         cprint(f"please run chmod -R +rx ./data/scripts to grant script access to the image", 'yellow')
         cprint(f"also run chmod +x ./update-node-ip.sh to make update-node-ip.sh execuatable", 'yellow')
@@ -276,16 +453,19 @@ def generateProdCompose(env: Environment, type, network):
         cprint("\nOperation cancelled.", 'red')
 
 
-def blocklessNode(environment, env, type, chain_network, name=None, topic=None):
+def blocklessNode(environment, env, type, chain_network, name=None, topic=None, assume_yes=False):
     """Initialize your Allora Worker Node with necessary boilerplates"""
 
+    try:
+        spec = get_node_type(type)
+    except ValueError as e:
+        cprint(str(e), 'red')
+        return
+
     if not check_docker_running():
         cprint("Docker is not running on your machine, please start docker before running this command", 'red')
         return
 
-    heads_url = f"https://raw.githubusercontent.com/allora-network/networks/main/{chain_network}/heads.txt"
-    allora_heads = fetch_content_with_curl(heads_url)
-
     if chain_network == 'allora-testnet-1':
         faucet_url = 'https://faucet.testnet-1.testnet.allora.network/'
         network = 'testnet-1'
@@ -305,67 +485,66 @@ def blocklessNode(environment, env, type, chain_network, name=None, topic=None):
             cprint(f"You must provide name when generating {type} in development", 'red')
             return
         
-        alloraTopic = None
-        if type == 'worker':
-            alloraTopic = f"allora-topic-{topic}-worker"
-        elif type == 'reputer':
-            alloraTopic = f"allora-topic-{topic}-reputer"
-
         print_allora_banner()
         cprint("Welcome to the Allora CLI!", 'green', attrs=['bold'])
         print(colored(f"Allora CLI assists in the seamless creation and deployment of Allora {type} nodes", 'yellow'))
         cprint(f"\nThis command will generate some files in the directory named '{name}'.", 'cyan')
         
-        if click.confirm(colored("\nWould you like to proceed?", 'white', attrs=['bold']), default=True):
-            cprint(f"\nProceeding with the creation of {type} node directory...", 'green')
-
-            head_peer_id = run_key_generate_command(name, type)
+        if confirm("\nWould you like to proceed?", assume_yes):
+            node_dir = os.path.join(os.getcwd(), name, type)
+            os.makedirs(node_dir, exist_ok=True)
+            pipeline = Pipeline(node_dir, 'dev')
+            if pipeline.has_progress():
+                cprint(f"\nResuming {type} node setup from {pipeline.state_path}", 'cyan')
+            else:
+                cprint(f"\nProceeding with the creation of {type} node directory...", 'green')
+
+            def write_dev_files(results):
+                # re-rendering config.yaml must not lose the account created by an earlier run
+                config_path = os.path.join(node_dir, 'config.yaml')
+                account = None
+                if os.path.exists(config_path):
+                    try:
+                        account = load_config(config_path, type).node
+                    except ConfigError:
+                        pass
+
+                allora_heads = select_boot_nodes(fetch_content_with_curl(HEADS_URL.format(network=chain_network)))
+
+                node_ip = get_public_ip()
+
+                context = spec.template_context({
+                    "name": name,
+                    "topic_id": topic,
+                    "network": chain_network,
+                    "faucet_url": faucet_url,
+                    "allora_heads": allora_heads,
+                    "allora_rpc_address": allora_rpc_address,
+                    "allora_api_address": allora_api_address,
+                    "node_ip": node_ip,
+                    "port": spec.dev_port
+                }, results)
+                file_configs = [
+                    {"template_name": template_name, "file_name": file_name, "context": context}
+                    for template_name, file_name in spec.dev_templates
+                ]
+
+                file_paths = generate_all_files(env, file_configs, Command.INIT, type, name)
+                if account is not None and account.has_account():
+                    config = load_config(config_path, type)
+                    for key in ('key_handle', 'mnemonic', 'hex_coded_pk', 'address'):
+                        setattr(config.node, key, getattr(account, key))
+                    save_config(config)
+                spec.run_hooks('post_generate', node_dir, context)
+                return file_paths
 
-            node_ip = get_public_ip()
-
-            file_configs = [
-                {
-                    "template_name": "Dockerfile.j2",
-                    "file_name": "Dockerfile",
-                    "context": {}
-                },
-                {
-                    "template_name": "main.py.j2",
-                    "file_name": "main.py",
-                    "context": {}
-                },
-                {
-                    "template_name": "dev-docker-compose.yaml.j2",
-                    "file_name": "dev-docker-compose.yaml",
-                    "context": {"head_peer_id": head_peer_id, "allora_topic_id": alloraTopic, "b7s_type": type}
-                },
-                {
-                    "template_name": "requirements.txt.j2",
-                    "file_name": "requirements.txt",
-                    "context": {}
-                },
-                {
-                    "template_name": "gitignore.j2",
-                    "file_name": ".gitignore",
-                    "context": {}
-                },
-                {
-                    "template_name": "env.j2",
-                    "file_name": ".env",
-                    "context": {}
-                },
-                {
-                    "template_name": "config.yaml.j2",
-                    "file_name": "config.yaml",
-                    "context": {"name": name, "topic_id": topic, "b7s_type": type, "network": chain_network, "faucet_url": faucet_url, "allora_heads": allora_heads, "allora_rpc_address": allora_rpc_address, "allora_api_address": allora_api_address, "node_ip": node_ip}
-                }
-            ]
-
-            generate_all_files(env, file_configs, Command.INIT, type, name)
-
-            address = generateWorkerAccount(name, type)
-
-            fundAddress(faucet_url, address, chain_network)
+            try:
+                results = {step: pipeline.run(step, func, name, type) for step, func in spec.key_steps}
+                pipeline.run('files', write_dev_files, results, checkpoint=False)
+                address = pipeline.run('account', generateWorkerAccount, name, type)
+                pipeline.run('fund', fundAddress, faucet_url, address, chain_network)
+            except PipelineError as e:
+                abort_pipeline(e, pipeline)
         else:
             cprint("\nOperation cancelled.", 'red')
     elif environment == 'prod':
@@ -373,7 +552,7 @@ def blocklessNode(environment, env, type, chain_network, name=None, topic=None):
         if not os.path.exists(devComposePath):
             cprint(f"You must initialize the {type} on dev please run allocmd generate {type} --env dev --name <{type} name> --topic <topic id> --network <{chain_network}> and then run the prod generate in the directory created", 'red')
         else:
-            generateProdCompose(env, type, chain_network)
+            generateProdCompose(env, type, chain_network, assume_yes)
 
 
 
@@ -384,7 +563,50 @@ def blocklessNode(environment, env, type, chain_network, name=None, topic=None):
 
 
 
-def deployWorker(env: Environment):
+def installHelmChart(release_name, values_file_name):
+    """Install or upgrade the universal-helm chart from the 'upshot' repository with the given values file."""
+
+    try:
+        current_context = subprocess.run(["kubectl", "config", "current-context"], check=True, stdout=subprocess.PIPE, text=True).stdout.strip()
+        print(colored("Current Kubernetes context: ", 'green') + colored(current_context, 'cyan'))
+    except subprocess.CalledProcessError:
+        print(colored("Failed to get current Kubernetes context. Is kubectl configured correctly?", 'red'))
+        return
+
+    try:
+        subprocess.run(["helm", "version"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        print(colored("Helm is already installed.", 'green'))
+    except subprocess.CalledProcessError:
+        try:
+            print(colored("Attempting to install Helm...", 'yellow'))
+            subprocess.run("curl -fsSL https://raw.githubusercontent.com/helm/helm/main/scripts/get-helm-3 | bash", shell=True, check=True)
+            print(colored("Helm installed successfully.", 'green'))
+        except subprocess.CalledProcessError as e:
+            print(colored(f"Failed to install Helm: {e}", 'red'))
+            return
+
+    try:
+
+        print(colored("Adding the 'upshot' Helm repository...", 'yellow'))
+        subprocess.run(["helm", "repo", "add", "upshot", "https://upshot-tech.github.io/helm-charts"], check=True)
+        subprocess.run(["helm", "repo", "update"], check=True)
+        print(colored("'upshot' repository added and updated successfully.", 'green'))
+        
+        print(colored("Installing the Helm chart 'universal-helm' from 'upshot' repository...", 'yellow'))
+        compose_dir = os.path.join(os.getcwd()) 
+        values_file_path = os.path.join(compose_dir, values_file_name)
+        if not os.path.exists(values_file_path):
+            print(colored("Values file not found.", 'red'))
+            return
+        subprocess.run(["helm", "upgrade", "--install", release_name, "upshot/universal-helm", "-f", values_file_path], check=True)
+        print(colored("Helm chart 'universal-helm' installed successfully.", 'green'))
+        return release_name
+        
+    except subprocess.CalledProcessError as e:
+        print(colored(f"An error occurred: {e}", 'red'))
+        return
+
+def deployWorker(env: Environment, assume_yes=False):
     """Deploy resource production kubernetes cluster"""
 
     print(colored('\nREQUIREMENTS', 'yellow', attrs=['bold']))
@@ -400,99 +622,48 @@ def deployWorker(env: Environment):
                   '1. helm: for deployment of worker into kubernetes cluster.\n'
                   '2. make: for installation of allora-chain to generate worker wallet account\n', 'yellow'))
 
-    if click.confirm(colored("\nWould you like to proceed?", 'white', attrs=['bold']), default=True):
+    if confirm("\nWould you like to proceed?", assume_yes):
 
         config_path = os.path.join(os.getcwd(), 'config.yaml')
         try:
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
-        except yaml.YAMLError as e:
+            config = load_config(config_path, 'worker', required=('image_uri', 'image_tag', 'boot_nodes', 'chain_rpc_address', 'chain_topic_id'))
+        except ConfigError as e:
             print(colored(f"Error reading config file: {e}", 'red', attrs=['bold']))
             return
 
-        worker_name = config['name']
-        faucet_url = config['faucet_url']
-        account_details = None
-        if not config['worker']['mnemonic'] or not config['worker']['hex_coded_pk'] or not config['worker']['address']:
-            account_details = create_worker_account(worker_name, faucet_url, 'worker')
-
-        mnemonic = account_details[0] if account_details else config['worker']['mnemonic']
-        hex_coded_pk = account_details[1] if account_details else config['worker']['hex_coded_pk']
-        address = account_details[2] if account_details else config['worker']['address']
-        worker_image_uri = config['worker']['image_uri']
-        worker_image_tag = config['worker']['image_tag']
-        boot_nodes = config['worker']['boot_nodes']
-        chain_rpc_address = config['worker']['chain_rpc_address']
-        chain_topic_id = config['worker']['chain_topic_id']
-
-        if not config['worker']['mnemonic'] or not config['worker']['hex_coded_pk'] or not config['worker']['address']:
-            config['worker']['mnemonic'] = mnemonic
-            config['worker']['hex_coded_pk'] = hex_coded_pk
-            config['worker']['address'] = address
-            with open(config_path, 'w') as file:
-                yaml.safe_dump(config, file)
-
-        file_configs = [
-            {
-                "template_name": "worker.values.yaml.j2",
-                "file_name": "worker.values.yaml",
-                "context": {
-                    "worker_image_uri": worker_image_uri, 
-                    "worker_image_tag": worker_image_tag, 
-                    "worker_name": worker_name, 
-                    "boot_nodes": boot_nodes, 
-                    "chain_rpc_address": chain_rpc_address, 
-                    "chain_topic_id": chain_topic_id, 
-                    "mnemonic": mnemonic, 
-                    "hex_coded_pk": hex_coded_pk
-                }
-            }
-        ]
-
-        generate_all_files(env, file_configs, Command.DEPLOY)
+        pipeline = Pipeline(os.getcwd(), 'deploy')
 
-        try:
-            current_context = subprocess.run(["kubectl", "config", "current-context"], check=True, stdout=subprocess.PIPE, text=True).stdout.strip()
-            print(colored("Current Kubernetes context: ", 'green') + colored(current_context, 'cyan'))
-        except subprocess.CalledProcessError:
-            print(colored("Failed to get current Kubernetes context. Is kubectl configured correctly?", 'red'))
-            return
+        def write_values_file(handle):
+            file_configs = [
+                {
+                    "template_name": "worker.values.yaml.j2",
+                    "file_name": "worker.values.yaml",
+                    "context": {
+                        "worker_image_uri": config.node.image_uri, 
+                        "worker_image_tag": config.node.image_tag, 
+                        "worker_name": config.name, 
+                        "boot_nodes": config.node.boot_nodes, 
+                        "chain_rpc_address": config.node.chain_rpc_address, 
+                        "chain_topic_id": config.node.chain_topic_id, 
+                        "key_secret_name": k8s_secret_name(handle)
+                    }
+                }
+            ]
 
-        try:
-            subprocess.run(["helm", "version"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            print(colored("Helm is already installed.", 'green'))
-        except subprocess.CalledProcessError:
-            try:
-                print(colored("Attempting to install Helm...", 'yellow'))
-                subprocess.run("curl -fsSL https://raw.githubusercontent.com/helm/helm/main/scripts/get-helm-3 | bash", shell=True, check=True)
-                print(colored("Helm installed successfully.", 'green'))
-            except subprocess.CalledProcessError as e:
-                print(colored(f"Failed to install Helm: {e}", 'red'))
-                return
+            return generate_all_files(env, file_configs, Command.DEPLOY)
 
         try:
-
-            print(colored("Adding the 'upshot' Helm repository...", 'yellow'))
-            subprocess.run(["helm", "repo", "add", "upshot", "https://upshot-tech.github.io/helm-charts"], check=True)
-            subprocess.run(["helm", "repo", "update"], check=True)
-            print(colored("'upshot' repository added and updated successfully.", 'green'))
-            
-            print(colored("Installing the Helm chart 'universal-helm' from 'upshot' repository...", 'yellow'))
-            compose_dir = os.path.join(os.getcwd()) 
-            values_file_path = os.path.join(compose_dir, "worker.values.yaml")
-            if not os.path.exists(values_file_path):
-                print(colored("Values file not found.", 'red'))
-                return
-            subprocess.run(["helm", "install", f"{worker_name}-worker", "upshot/universal-helm", "-f", values_file_path], check=True)
-            print(colored("Helm chart 'universal-helm' installed successfully.", 'green'))
-            
-        except subprocess.CalledProcessError as e:
-            print(colored(f"An error occurred: {e}", 'red'))
-            return
+            address = pipeline.run('account', generateWorkerAccount, config.name, 'worker', config_path)
+            # kubectl apply is idempotent and the target cluster may have changed, apply it on every run
+            handle = pipeline.run('secret', lambda address: apply_k8s_secret(load_account_keys(load_config(config_path, 'worker'))), address, checkpoint=False)
+            pipeline.run('values', write_values_file, handle, checkpoint=False)
+            pipeline.run('helm', installHelmChart, f"{config.name}-worker", "worker.values.yaml", checkpoint=False)
+        except PipelineError as e:
+            abort_pipeline(e, pipeline)
     else:
         print(colored('Operation cancelled.', 'magenta'))
 
-def deployValidator(env: Environment):
+def deployValidator(env: Environment, assume_yes=False):
     """Deploy resource production kubernetes cluster"""
 
     print(colored('\nREQUIREMENTS', 'yellow', attrs=['bold']))
@@ -505,84 +676,39 @@ def deployValidator(env: Environment):
                   '1. helm: for deployment of worker into kubernetes cluster.\n'
                   '2. make: for installation of allora-chain to generate worker wallet account\n', 'yellow'))
 
-    if click.confirm(colored("\nWould you like to proceed?", 'white', attrs=['bold']), default=True):
+    if confirm("\nWould you like to proceed?", assume_yes):
 
         config_path = os.path.join(os.getcwd(), 'config.yaml')
         try:
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
-        except yaml.YAMLError as e:
+            config = load_config(config_path, 'validator')
+        except ConfigError as e:
             print(colored(f"Error reading config file: {e}", 'red', attrs=['bold']))
             return
 
-        validator_name = config['name']
-        faucet_url = config['faucet_url']
-        account_details = None
-        if not config['validator']['mnemonic'] or not config['validator']['hex_coded_pk'] or not config['validator']['address']:
-            account_details = create_worker_account(validator_name, faucet_url, 'validator')
-
-        mnemonic = account_details[0] if account_details else config['validator']['mnemonic']
-        hex_coded_pk = account_details[1] if account_details else config['validator']['hex_coded_pk']
-        address = account_details[2] if account_details else config['validator']['address']
-
-        if not config['validator']['mnemonic'] or not config['validator']['hex_coded_pk'] or not config['validator']['address']:
-            config['validator']['mnemonic'] = mnemonic
-            config['validator']['hex_coded_pk'] = hex_coded_pk
-            config['validator']['address'] = address
-            with open(config_path, 'w') as file:
-                yaml.safe_dump(config, file)
-
-        file_configs = [
-            {
-                "template_name": "validator.values.yaml.j2",
-                "file_name": "validator.values.yaml",
-                "context": {
-                    "name": validator_name, 
-                    "hex_coded_pk": hex_coded_pk
-                }
-            }
-        ]
-
-        generate_all_files(env, file_configs, Command.DEPLOY)
+        pipeline = Pipeline(os.getcwd(), 'deploy')
 
-        try:
-            current_context = subprocess.run(["kubectl", "config", "current-context"], check=True, stdout=subprocess.PIPE, text=True).stdout.strip()
-            print(colored("Current Kubernetes context: ", 'green') + colored(current_context, 'cyan'))
-        except subprocess.CalledProcessError:
-            print(colored("Failed to get current Kubernetes context. Is kubectl configured correctly?", 'red'))
-            return
+        def write_values_file(handle):
+            file_configs = [
+                {
+                    "template_name": "validator.values.yaml.j2",
+                    "file_name": "validator.values.yaml",
+                    "context": {
+                        "name": config.name, 
+                        "key_secret_name": k8s_secret_name(handle)
+                    }
+                }
+            ]
 
-        try:
-            subprocess.run(["helm", "version"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            print(colored("Helm is already installed.", 'green'))
-        except subprocess.CalledProcessError:
-            try:
-                print(colored("Attempting to install Helm...", 'yellow'))
-                subprocess.run("curl -fsSL https://raw.githubusercontent.com/helm/helm/main/scripts/get-helm-3 | bash", shell=True, check=True)
-                print(colored("Helm installed successfully.", 'green'))
-            except subprocess.CalledProcessError as e:
-                print(colored(f"Failed to install Helm: {e}", 'red'))
-                return
+            return generate_all_files(env, file_configs, Command.DEPLOY)
 
         try:
-
-            print(colored("Adding the 'upshot' Helm repository...", 'yellow'))
-            subprocess.run(["helm", "repo", "add", "upshot", "https://upshot-tech.github.io/helm-charts"], check=True)
-            subprocess.run(["helm", "repo", "update"], check=True)
-            print(colored("'upshot' repository added and updated successfully.", 'green'))
-            
-            print(colored("Installing the Helm chart 'universal-helm' from 'upshot' repository...", 'yellow'))
-            compose_dir = os.path.join(os.getcwd()) 
-            values_file_path = os.path.join(compose_dir, "validator.values.yaml")
-            if not os.path.exists(values_file_path):
-                print(colored("Values file not found.", 'red'))
-                return
-            subprocess.run(["helm", "install", f"{validator_name}-validator", "upshot/universal-helm", "-f", values_file_path], check=True)
-            print(colored("Helm chart 'universal-helm' installed successfully.", 'green'))
-            
-        except subprocess.CalledProcessError as e:
-            print(colored(f"An error occurred: {e}", 'red'))
-            return
+            address = pipeline.run('account', generateWorkerAccount, config.name, 'validator', config_path)
+            # kubectl apply is idempotent and the target cluster may have changed, apply it on every run
+            handle = pipeline.run('secret', lambda address: apply_k8s_secret(load_account_keys(load_config(config_path, 'validator'))), address, checkpoint=False)
+            pipeline.run('values', write_values_file, handle, checkpoint=False)
+            pipeline.run('helm', installHelmChart, f"{config.name}-validator", "validator.values.yaml", checkpoint=False)
+        except PipelineError as e:
+            abort_pipeline(e, pipeline)
     else:
         print(colored('Operation cancelled.', 'magenta'))
 
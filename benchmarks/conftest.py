@@ -0,0 +1,87 @@
+import os
+import shlex
+import subprocess
+import types
+import pytest
+from jinja2 import Environment, FileSystemLoader
+from allocmd.cli import template_path
+from allocmd.utilities import heads, publicip, utils
+
+HEADS = ','.join(f"/ip4/10.0.{i // 256}.{i % 256}/tcp/9010/p2p/12D3KooWHead{i:04d}" for i in range(8))
+PUBLIC_IP = '203.0.113.7'
+ALLORAD_KEYS_ADD = """
+- address: allo1qz8k6m0j0v7x2w3e4r5t6y7u8i9o0p1a2s3d4f
+  name: {name}
+  pubkey: '{{"@type":"/cosmos.crypto.secp256k1.PubKey","key":"A1b2C3d4"}}'
+  type: local
+
+
+**Important** write this mnemonic phrase in a safe place.
+It is the only way to recover your account if you ever forget your password.
+
+abandon ability able about above absent absorb abstract absurd abuse access accident
+"""
+
+
+class FakeTools:
+    """Local stand-ins for docker, curl, git, make, go and allorad so generation runs offline."""
+
+    PIPE = subprocess.PIPE
+    STDOUT = subprocess.STDOUT
+    DEVNULL = subprocess.DEVNULL
+    CalledProcessError = subprocess.CalledProcessError
+    CompletedProcess = subprocess.CompletedProcess
+
+    def run(self, args, **kwargs):
+        argv = shlex.split(args) if isinstance(args, str) else list(args)
+        stdout = ''
+
+        if argv[:2] == ['docker', 'run']:
+            # the key generation container writes the head and node identities under data/
+            data_dir = next(arg.split(':')[0] for arg in argv if arg.endswith(':/data'))
+            data_dir = data_dir.replace('$(pwd)', os.getcwd())
+            os.makedirs(os.path.join(data_dir, 'head', 'key'), exist_ok=True)
+            with open(os.path.join(data_dir, 'head', 'key', 'identity'), 'w') as file:
+                file.write('12D3KooWLocalHeadIdentity')
+        elif argv[0] in ('mkdir', 'chmod'):
+            return subprocess.run(args, **kwargs)
+        elif argv[0] == 'curl':
+            url = argv[-1]
+            if url.endswith('heads.txt'):
+                stdout = HEADS
+        elif argv[:3] == ['go', 'env', 'GOPATH']:
+            stdout = '/tmp/go'
+        elif argv[:3] == ['allorad', 'keys', 'add']:
+            stdout = ALLORAD_KEYS_ADD.format(name=argv[3])
+
+        if not kwargs.get('text') and not kwargs.get('universal_newlines'):
+            stdout = stdout.encode()
+        return subprocess.CompletedProcess(argv, 0, stdout=stdout, stderr='' if kwargs.get('text') else b'')
+
+    def Popen(self, args, **kwargs):
+        return types.SimpleNamespace(communicate=lambda input=None: ('a1' * 32, ''), returncode=0)
+
+
+def fake_probe_head(multiaddr, timeout=heads.DEFAULT_TIMEOUT):
+    latency = float(sum(map(ord, multiaddr)) % 97)
+    return heads.HeadProbe(multiaddr, True, True, latency / 2, latency, None)
+
+
+@pytest.fixture(scope='session')
+def template_env():
+    return Environment(loader=FileSystemLoader(template_path), autoescape=True)
+
+
+@pytest.fixture
+def offline(monkeypatch, tmp_path):
+    """Run allocmd inside a scratch directory with every external tool replaced by FakeTools."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(utils, 'subprocess', FakeTools())
+    monkeypatch.setattr(utils.shutil, 'which', lambda name: f'/usr/bin/{name}')
+    monkeypatch.setattr(utils.time, 'sleep', lambda seconds: None)
+    monkeypatch.setattr(heads, 'probe_head', fake_probe_head)
+    monkeypatch.setattr(publicip, '_fetch', lambda url, timeout: PUBLIC_IP)
+    monkeypatch.setattr(publicip, '_cache', {})
+    monkeypatch.setenv('ALLOCMD_KEYSTORE', str(tmp_path / 'keystore.db'))
+    monkeypatch.setenv('ALLOCMD_KEYSTORE_PASSPHRASE', 'benchmark')
+    return tmp_path
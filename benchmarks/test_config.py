@@ -0,0 +1,49 @@
+import os
+from allocmd.utilities import config as config_module
+from allocmd.utilities.config import load_config, save_config
+from conftest import HEADS, PUBLIC_IP
+
+
+def write_config(template_env, path):
+    content = template_env.get_template('config.yaml.j2').render(
+        name='bench', topic_id=1, b7s_type='worker', network='edgenet',
+        faucet_url='https://faucet.edgenet.allora.network/', allora_heads=HEADS,
+        allora_rpc_address='https://allora-rpc.edgenet.allora.network/',
+        allora_api_address='https://allora-api.edgenet.allora.network/', node_ip=PUBLIC_IP,
+    )
+    with open(path, 'w') as file:
+        file.write(content)
+
+
+def test_load_config_cold(benchmark, template_env, offline):
+    path = os.path.join(offline, 'config.yaml')
+    write_config(template_env, path)
+
+    def load():
+        config_module._cache.clear()
+        return load_config(path, 'worker', required=('allora_heads', 'topic_id'))
+
+    assert benchmark(load).name == 'bench'
+
+
+def test_load_config_cached(benchmark, template_env, offline):
+    path = os.path.join(offline, 'config.yaml')
+    write_config(template_env, path)
+    load_config(path, 'worker')
+
+    assert benchmark(load_config, path, 'worker').name == 'bench'
+
+
+def test_config_load_dump_cycle(benchmark, template_env, offline):
+    path = os.path.join(offline, 'config.yaml')
+    write_config(template_env, path)
+
+    def cycle():
+        config = load_config(path, 'worker')
+        config.node.address = 'allo1qz8k6m0j0v7x2w3e4r5t6y7u8i9o0p1a2s3d4f' if not config.node.address else ''
+        save_config(config)
+        return config
+
+    benchmark(cycle)
+    with open(path) as file:
+        assert file.readline().startswith('# place all worker configuration variables here')
@@ -0,0 +1,33 @@
+import os
+import pytest
+from allocmd.cli import env
+from allocmd.utilities.config import load_config
+from allocmd.utilities.utils import blocklessNode, generateProdCompose
+
+FLEET_SIZES = [1, 10, 100, 1000]
+
+
+def generate_fleet(root, size):
+    for index in range(size):
+        os.chdir(root)
+        name = f"node-{index:04d}"
+        blocklessNode('dev', env, 'worker', 'edgenet', name, 1, assume_yes=True)
+        os.chdir(os.path.join(root, name, 'worker'))
+        generateProdCompose(env, 'worker', 'edgenet', assume_yes=True)
+    os.chdir(root)
+
+
+@pytest.mark.parametrize('size', FLEET_SIZES)
+def test_generate_fleet(benchmark, offline, size):
+    runs = iter(range(1000))
+
+    def setup():
+        root = os.path.join(offline, f"run-{next(runs)}")
+        os.makedirs(root)
+        return (root, size), {}
+
+    benchmark.pedantic(generate_fleet, setup=setup, rounds=3 if size < 1000 else 1)
+
+    last = os.path.join(offline, 'run-0', f"node-{size - 1:04d}", 'worker')
+    assert load_config(os.path.join(last, 'config.yaml'), 'worker').node.key_handle
+    assert os.path.exists(os.path.join(last, 'prod-docker-compose.yaml'))
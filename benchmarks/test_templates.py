@@ -0,0 +1,36 @@
+import os
+import pytest
+from allocmd.cli import template_path
+from allocmd.utilities.typings import Command
+from allocmd.utilities.utils import generate_all_files
+from conftest import HEADS, PUBLIC_IP
+
+TEMPLATES = sorted(name for name in os.listdir(template_path) if name.endswith('.j2'))
+
+CONTEXT = {
+    "name": "bench", "worker_name": "bench", "val_name": "bench", "b7s_type": "worker",
+    "network": "edgenet", "faucet_url": "https://faucet.edgenet.allora.network/",
+    "topic_id": 1, "chain_topic_id": 1, "allora_topic_id": "allora-topic-1-worker",
+    "allora_heads": HEADS, "boot_nodes": HEADS, "head_peer_id": "12D3KooWLocalHeadIdentity",
+    "allora_rpc_address": "https://allora-rpc.edgenet.allora.network/",
+    "chain_rpc_address": "https://allora-rpc.edgenet.allora.network/",
+    "allora_api_address": "https://allora-api.edgenet.allora.network/",
+    "node_ip": PUBLIC_IP, "role": "worker", "port": 9011, "metrics_port": 2113, "key_handle": "bench.worker", "key_secret_name": "bench.worker",
+    "worker_image_uri": "registry.example.com/bench", "worker_image_tag": "latest",
+}
+
+
+@pytest.mark.parametrize('template_name', TEMPLATES)
+def test_render_template(benchmark, template_env, template_name):
+    template = template_env.get_template(template_name)
+    content = benchmark(template.render, **CONTEXT)
+    assert content
+
+
+def test_generate_all_files(benchmark, template_env, offline):
+    file_configs = [
+        {"template_name": name, "file_name": name[:-len('.j2')], "context": CONTEXT}
+        for name in TEMPLATES
+    ]
+    file_paths = benchmark(generate_all_files, template_env, file_configs, Command.DEPLOY)
+    assert len(file_paths) == len(TEMPLATES)
@@ -22,6 +22,7 @@ setup(
         'jinja2',
         'PyYAML',
         'termcolor',
+        'cryptography',
     ],
     entry_points='''
         [console_scripts]
@@ -0,0 +1,104 @@
+import yaml
+import pytest
+from allocmd.utilities.config import ConfigError, load_config, save_config
+
+CONFIG = """\
+name: alice # the node name
+network: edgenet
+faucet_url: https://faucet.edgenet.allora.network/
+node_public_ip: ""
+
+worker:   # node settings
+  allora_heads: /ip4/10.0.0.1/tcp/9010/p2p/12D3KooWHead
+  topic_id: 1
+  # written by allocmd, see README
+  key_handle: ""
+  address: "" # filled by allocmd
+  image_tag: "#latest" # quoted hash is not a comment
+"""
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text(CONFIG)
+    return path
+
+
+def test_save_keeps_comments_on_headers_and_values(config_path):
+    config = load_config(config_path, 'worker')
+    config.node.address = 'allo1abc'
+    config.node.key_handle = 'alice.worker'
+    config.node.image_tag = 'v2'
+    config.name = 'bob'
+    save_config(config)
+
+    content = config_path.read_text()
+    assert content.count('worker:') == 1
+    assert 'worker:   # node settings\n' in content
+    assert 'name: bob # the node name\n' in content
+    assert '  # written by allocmd, see README\n' in content
+    assert '  key_handle: alice.worker\n' in content
+    assert '  address: allo1abc # filled by allocmd\n' in content
+    assert '  image_tag: v2 # quoted hash is not a comment\n' in content
+
+    saved = load_config(config_path, 'worker')
+    assert (saved.name, saved.node.address, saved.node.key_handle, saved.node.topic_id) == ('bob', 'allo1abc', 'alice.worker', 1)
+
+
+def test_save_appends_missing_key_to_section(config_path):
+    config = load_config(config_path, 'worker')
+    config.node.boot_nodes = '/ip4/10.0.0.2/tcp/9010/p2p/12D3KooWBoot'
+    save_config(config)
+
+    content = config_path.read_text()
+    assert content.endswith('  boot_nodes: /ip4/10.0.0.2/tcp/9010/p2p/12D3KooWBoot\n')
+    assert 'image_uri' not in content
+    assert load_config(config_path, 'worker').node.boot_nodes == config.node.boot_nodes
+
+
+def test_save_appends_missing_section(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text("name: alice\nworker:\n  topic_id: 1\n")
+    config = load_config(path, 'worker')
+    config.node.address = 'allo1abc'
+    save_config(config)
+
+    assert yaml.safe_load(path.read_text())['worker'] == {'topic_id': 1, 'address': 'allo1abc'}
+
+
+@pytest.mark.parametrize('value', ['', 'yes', '123', 'a: b', '# not a comment', "it's", 'null', 'x #y'])
+def test_save_quotes_values_that_need_it(config_path, value):
+    config = load_config(config_path, 'worker')
+    config.node.address = value
+    save_config(config)
+
+    assert load_config(config_path, 'worker').node.address == value
+    assert '# filled by allocmd\n' in config_path.read_text()
+
+
+def test_save_replaces_values_wrapped_over_several_lines(tmp_path):
+    mnemonic = ' '.join(['abandon', 'ability', 'able', 'about', 'above', 'absent'] * 4)
+    path = tmp_path / 'config.yaml'
+    with open(path, 'w') as file:
+        yaml.safe_dump({'name': 'alice', 'worker': {'address': 'allo1abc', 'mnemonic': mnemonic, 'topic_id': 1}}, file)
+    assert len(path.read_text().splitlines()) > 5
+
+    config = load_config(path, 'worker')
+    assert config.node.mnemonic == mnemonic
+    config.node.mnemonic = ''
+    save_config(config)
+
+    assert 'abandon' not in path.read_text()
+    saved = load_config(path, 'worker').node
+    assert (saved.address, saved.mnemonic, saved.topic_id) == ('allo1abc', '', 1)
+
+    saved_config = load_config(path, 'worker')
+    saved_config.node.mnemonic = mnemonic
+    save_config(saved_config)
+    assert load_config(path, 'worker').node.mnemonic == mnemonic
+
+
+def test_load_reports_missing_required_keys(config_path):
+    with pytest.raises(ConfigError, match='worker.image_uri is missing'):
+        load_config(config_path, 'worker', required=('image_uri',))
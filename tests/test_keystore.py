@@ -0,0 +1,105 @@
+import io
+import os
+import stat
+import yaml
+import pytest
+from click.testing import CliRunner
+from allocmd.cli import cli
+from allocmd.utilities.config import load_config
+from allocmd.utilities.keystore import KeyEntry, Keystore, KeystoreError
+from allocmd.utilities.utils import store_account_keys
+
+ALICE = KeyEntry('alice.worker', 'allo1alice', 'abandon ability able', 'a1' * 32)
+BOB = KeyEntry('bob.reputer', 'allo1bob', 'absorb abstract absurd', 'b2' * 32)
+
+
+@pytest.fixture
+def keystore_file(tmp_path, monkeypatch):
+    path = tmp_path / 'keystore.db'
+    monkeypatch.setenv('ALLOCMD_KEYSTORE', str(path))
+    monkeypatch.setenv('ALLOCMD_KEYSTORE_PASSPHRASE', 'secret')
+    return path
+
+
+def test_put_get_round_trip(keystore_file):
+    with Keystore(str(keystore_file), 'secret') as store:
+        store.put(ALICE)
+    with Keystore(str(keystore_file), 'secret') as store:
+        assert store.get('alice.worker') == ALICE
+        assert 'alice.worker' in store and 'bob.reputer' not in store
+        with pytest.raises(KeystoreError):
+            store.get('bob.reputer')
+
+    assert stat.S_IMODE(os.stat(keystore_file).st_mode) == 0o600
+    assert ALICE.mnemonic.encode() not in keystore_file.read_bytes()
+
+
+def test_wrong_passphrase_is_rejected(keystore_file):
+    with Keystore(str(keystore_file), 'secret') as store:
+        store.put(ALICE)
+    with pytest.raises(KeystoreError, match='wrong passphrase'):
+        Keystore(str(keystore_file), 'not the passphrase')
+
+
+def test_addresses_do_not_need_the_passphrase(keystore_file):
+    with Keystore(str(keystore_file), 'secret') as store:
+        store.put_many([BOB, ALICE])
+    with Keystore(str(keystore_file), None) as store:
+        assert list(store.addresses()) == [('alice.worker', 'allo1alice'), ('bob.reputer', 'allo1bob')]
+        with pytest.raises(KeystoreError, match='locked'):
+            store.get('alice.worker')
+
+
+def test_export_then_import(tmp_path):
+    exported = io.StringIO()
+    with Keystore(str(tmp_path / 'a.db'), 'one') as store:
+        store.put_many([ALICE, BOB])
+        assert store.export_jsonl(exported, ['bob.reputer']) == 1
+        assert store.export_jsonl(exported) == 2
+
+    with Keystore(str(tmp_path / 'b.db'), 'two') as store:
+        assert store.import_jsonl(io.StringIO(exported.getvalue())) == 3
+        assert list(store.export_entries()) == [ALICE, BOB]
+
+
+def test_store_account_keys_migrates_inline_keys(keystore_file, tmp_path):
+    # earlier versions wrote the account with yaml.safe_dump, which wraps a 24-word mnemonic over several lines
+    legacy = KeyEntry('alice.worker', 'allo1alice', ' '.join(['abandon', 'ability', 'able', 'about', 'above', 'absent'] * 4), 'c3' * 32)
+    config_path = tmp_path / 'config.yaml'
+    with open(config_path, 'w') as file:
+        yaml.safe_dump({
+            'name': 'alice',
+            'network': 'edgenet',
+            'worker': {'address': legacy.address, 'mnemonic': legacy.mnemonic, 'hex_coded_pk': legacy.hex_coded_pk, 'topic_id': 1},
+        }, file)
+    config = load_config(config_path, 'worker')
+
+    with Keystore(str(keystore_file), 'secret') as store:
+        assert store_account_keys(config, store) == 'alice.worker'
+        assert store.get('alice.worker') == legacy
+
+    migrated = load_config(config_path, 'worker').node
+    assert (migrated.key_handle, migrated.address, migrated.mnemonic, migrated.hex_coded_pk, migrated.topic_id) == ('alice.worker', 'allo1alice', '', '', 1)
+    content = config_path.read_text()
+    assert 'abandon' not in content and legacy.hex_coded_pk not in content
+
+
+def test_cli_export_is_private(keystore_file, tmp_path):
+    with Keystore(str(keystore_file), 'secret') as store:
+        store.put(ALICE)
+    destination = tmp_path / 'keys.jsonl'
+
+    result = CliRunner().invoke(cli, ['keystore', 'export', str(destination)])
+
+    assert result.exit_code == 0, result.output
+    assert stat.S_IMODE(os.stat(destination).st_mode) == 0o600
+    assert 'allo1alice' in destination.read_text()
+
+
+@pytest.mark.parametrize('command', [['list'], ['remove', 'alice.worker']])
+def test_cli_does_not_create_a_missing_keystore(keystore_file, command):
+    result = CliRunner().invoke(cli, ['keystore', *command])
+
+    assert result.exit_code == 0, result.output
+    assert 'no keystore found' in result.output
+    assert not keystore_file.exists()
@@ -0,0 +1,16 @@
+import subprocess
+import sys
+from click.testing import CliRunner
+from allocmd.cli import cli
+
+
+def test_importing_the_cli_does_not_load_node_type_plugins():
+    code = "import allocmd.cli, allocmd.utilities.nodetypes as nodetypes; assert not nodetypes._discovered"
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_probe_rejects_unknown_node_type():
+    result = CliRunner().invoke(cli, ['heads', 'probe', '--update-config', 'oracle'])
+
+    assert result.exit_code == 2
+    assert "unknown node type 'oracle'" in result.output
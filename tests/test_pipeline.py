@@ -0,0 +1,51 @@
+import click
+import pytest
+from allocmd.utilities.pipeline import Pipeline, PipelineError
+from allocmd.utilities.utils import abort_pipeline
+
+
+class Recorder:
+    def __init__(self, result='done'):
+        self.calls = []
+        self.result = result
+
+    def __call__(self, *args):
+        self.calls.append(args)
+        return self.result
+
+
+def test_step_is_skipped_when_inputs_are_unchanged(tmp_path):
+    step = Recorder()
+    assert Pipeline(tmp_path, 'dev').run('keys', step, 'alice', 'worker') == 'done'
+    assert Pipeline(tmp_path, 'dev').run('keys', step, 'alice', 'worker') == 'done'
+    assert step.calls == [('alice', 'worker')]
+
+
+def test_step_runs_again_when_inputs_change(tmp_path):
+    step = Recorder()
+    Pipeline(tmp_path, 'dev').run('fund', step, 'allo1old')
+    Pipeline(tmp_path, 'dev').run('fund', step, 'allo1new')
+    assert step.calls == [('allo1old',), ('allo1new',)]
+
+
+def test_unchecked_step_always_runs(tmp_path):
+    step = Recorder()
+    pipeline = Pipeline(tmp_path, 'deploy')
+    pipeline.run('helm', step, 'release', checkpoint=False)
+    pipeline.run('helm', step, 'release', checkpoint=False)
+    assert len(step.calls) == 2
+    assert not Pipeline(tmp_path, 'deploy').is_done('helm')
+
+
+def test_failed_step_is_not_checkpointed(tmp_path):
+    pipeline = Pipeline(tmp_path, 'dev')
+    with pytest.raises(PipelineError) as error:
+        pipeline.run('account', Recorder(result=None), 'alice')
+    assert error.value.step == 'account'
+    assert not Pipeline(tmp_path, 'dev').has_progress()
+
+
+def test_abort_pipeline_exits_non_zero(tmp_path):
+    with pytest.raises(click.exceptions.Exit) as exit:
+        abort_pipeline(PipelineError('fund', 'faucet unavailable'), Pipeline(tmp_path, 'dev'))
+    assert exit.value.exit_code == 1
@@ -0,0 +1,87 @@
+import subprocess
+import types
+import click
+import pytest
+from allocmd.utilities import utils
+
+COMPOSE = """\
+services:
+  alice:
+    command:
+      - allora-node
+      - --dialback-address=198.51.100.1
+"""
+
+
+class FakeCompose:
+    """Stands in for subprocess, failing the first `failures` restarts."""
+
+    CalledProcessError = subprocess.CalledProcessError
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.restarts = []
+
+    def run(self, args, **kwargs):
+        self.restarts.append(args)
+        if len(self.restarts) <= self.failures:
+            raise subprocess.CalledProcessError(1, args)
+        return subprocess.CompletedProcess(args, 0)
+
+
+@pytest.fixture
+def node_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'prod-docker-compose.yaml').write_text(COMPOSE)
+    monkeypatch.setattr(utils, 'get_public_ip', lambda refresh=False: '203.0.113.7')
+    return tmp_path
+
+
+def stop_after(count):
+    calls = []
+
+    def sleep(seconds):
+        calls.append(seconds)
+        if len(calls) >= count:
+            raise KeyboardInterrupt
+    return sleep
+
+
+def test_failed_restart_is_retried_on_the_next_interval(node_dir, monkeypatch):
+    compose = FakeCompose(failures=1)
+    monkeypatch.setattr(utils, 'subprocess', compose)
+    monkeypatch.setattr(utils.time, 'sleep', stop_after(3))
+
+    utils.watchNodeIp(60)
+
+    assert '--dialback-address=203.0.113.7' in (node_dir / 'prod-docker-compose.yaml').read_text()
+    assert compose.restarts == [['docker-compose', '-f', 'prod-docker-compose.yaml', 'up', '-d', '--no-deps', 'alice']] * 2
+
+
+def test_once_exits_non_zero_when_the_restart_fails(node_dir, monkeypatch):
+    monkeypatch.setattr(utils, 'subprocess', FakeCompose(failures=1))
+
+    with pytest.raises(click.exceptions.Exit) as exit:
+        utils.watchNodeIp(60, once=True)
+    assert exit.value.exit_code == 1
+
+
+def test_falls_back_to_the_compose_plugin(node_dir, monkeypatch):
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args[:2])
+        if args[0] == 'docker-compose':
+            raise FileNotFoundError(args[0])
+        return subprocess.CompletedProcess(args, 0)
+    monkeypatch.setattr(utils, 'subprocess', types.SimpleNamespace(run=run, CalledProcessError=subprocess.CalledProcessError))
+
+    assert utils.watchNodeIp(60, once=True) == '203.0.113.7'
+    assert calls == [['docker-compose', '-f'], ['docker', 'compose']]
+
+
+def test_missing_dialback_address_is_an_error(node_dir):
+    (node_dir / 'prod-docker-compose.yaml').write_text("services:\n  alice:\n    command:\n      - allora-node\n")
+
+    with pytest.raises(click.exceptions.Exit):
+        utils.watchNodeIp(60, once=True)